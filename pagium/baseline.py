@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+
+"""
+Cross-run performance baseline of scenarios and regression report.
+
+Metrics of the scenario are taken from the profiler: time and driver
+commands of page methods (e.g. Page.open), page element resolution,
+hooks and matcher waits. Current run is compared with the rolling
+baseline of previous runs of the scenario.
+
+>>> import os, tempfile
+
+>>> store = BaselineStore(os.path.join(tempfile.mkdtemp(), 'baseline.json'), min_runs=3)
+
+>>> for duration in (1.0, 1.1, 0.9, 1.0):
+...     store.record('login', {'LoginPage.open:time': duration, 'LoginPage.open:commands': 2})
+
+>>> report = store.compare('login', {'LoginPage.open:time': 2.5, 'LoginPage.open:commands': 2})
+
+>>> [regression.metric for regression in report.regressions]
+['LoginPage.open:time']
+
+>>> report.has_regressions
+True
+
+>>> store.compare('login', {'LoginPage.open:time': 1.05, 'LoginPage.open:commands': 2}).regressions
+[]
+"""
+
+import os
+import json
+import tempfile
+import statistics
+from contextlib import contextmanager
+from typing import Union, NamedTuple
+
+from pagium.profiler import Profiler
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+DEFAULT_WINDOW = 20
+DEFAULT_MIN_RUNS = 5
+DEFAULT_THRESHOLD = 3.0
+DEFAULT_TOLERANCE = 0.1
+DEFAULT_MIN_TIME_DELTA = 0.01
+
+
+def metrics_from_profile(profiler: Profiler) -> dict:
+    """
+    Total time and driver commands of profiled nodes aggregated by node name
+    """
+    metrics = {}
+
+    for node in profiler.root.walk():
+        if node.parent is None or node.name.startswith('get '):
+            continue
+
+        metrics[f'{node.name}:time'] = metrics.get(f'{node.name}:time', 0.0) + node.total
+        metrics[f'{node.name}:commands'] = metrics.get(f'{node.name}:commands', 0) + node.commands
+
+    metrics['total:time'] = profiler.root.total
+    metrics['total:commands'] = profiler.root.commands
+
+    return metrics
+
+
+class Regression(NamedTuple):
+    metric: str
+    current: float
+    mean: float
+    stdev: float
+
+    def __str__(self):
+        return f'{self.metric}: {self.current:.6g} (baseline {self.mean:.6g} ± {self.stdev:.6g})'
+
+
+class RegressionReport:
+
+    def __init__(self, scenario: str, runs: int, regressions: list):
+        self.scenario = scenario
+        self.runs = runs
+        self.regressions = regressions
+
+    @property
+    def ok(self) -> bool:
+        return not self.regressions
+
+    @property
+    def has_regressions(self) -> bool:
+        return bool(self.regressions)
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__} {self.scenario}: regressions={len(self.regressions)}, runs={self.runs}>'
+
+    def __str__(self):
+        if not self.regressions:
+            return f'{self.scenario}: no regressions against {self.runs} runs'
+
+        lines = [f'{self.scenario}: {len(self.regressions)} regressions against {self.runs} runs']
+        lines.extend(f'  {regression}' for regression in self.regressions)
+
+        return '\n'.join(lines)
+
+
+class BaselineStore:
+
+    def __init__(self,
+                 path: str,
+                 window: int = DEFAULT_WINDOW,
+                 min_runs: int = DEFAULT_MIN_RUNS,
+                 threshold: float = DEFAULT_THRESHOLD,
+                 tolerance: float = DEFAULT_TOLERANCE,
+                 min_time_delta: float = DEFAULT_MIN_TIME_DELTA):
+        """
+        Metric is regressed if it exceeds baseline mean by "threshold"
+        standard deviations and by "tolerance" part of the mean,
+        time metrics also by "min_time_delta" seconds
+        """
+        self._path = path
+        self._window = window
+        self._min_runs = min_runs
+        self._threshold = threshold
+        self._tolerance = tolerance
+        self._min_time_delta = min_time_delta
+
+        self._data = None
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__} {self._path}>'
+
+    @property
+    def path(self):
+        return self._path
+
+    @property
+    def data(self) -> dict:
+        if self._data is None:
+            if os.path.exists(self._path):
+                with open(self._path) as fp:
+                    self._data = json.load(fp)
+            else:
+                self._data = {}
+
+        return self._data
+
+    @contextmanager
+    def _locked(self):
+        """
+        Exclusive lock of the baseline file between processes, fcntl is
+        not available on windows, the file is not locked there
+        """
+        with open(f'{self._path}.lock', 'a') as fp:
+            if fcntl is not None:
+                fcntl.flock(fp, fcntl.LOCK_EX)
+
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(fp, fcntl.LOCK_UN)
+
+    def _save(self):
+        with tempfile.NamedTemporaryFile(
+            'w',
+            dir=os.path.dirname(self._path) or '.',
+            prefix=f'{os.path.basename(self._path)}.',
+            suffix='.tmp',
+            delete=False,
+        ) as fp:
+            json.dump(self.data, fp, indent=2, sort_keys=True)
+
+        try:
+            os.replace(fp.name, self._path)
+        except OSError:
+            os.remove(fp.name)
+            raise
+
+    def runs(self, scenario: str) -> list:
+        return list(self.data.get(scenario, []))
+
+    def record(self, scenario: str, metrics: Union[dict, Profiler]):
+        if isinstance(metrics, Profiler):
+            metrics = metrics_from_profile(metrics)
+
+        with self._locked():
+            # runs of parallel writers are merged with the fresh file
+            self._data = None
+
+            runs = self.data.setdefault(scenario, [])
+            runs.append(metrics)
+            del runs[:-self._window]
+
+            self._save()
+
+    def compare(self, scenario: str, metrics: Union[dict, Profiler]) -> RegressionReport:
+        if isinstance(metrics, Profiler):
+            metrics = metrics_from_profile(metrics)
+
+        runs = self.runs(scenario)
+        regressions = []
+
+        if len(runs) < self._min_runs:
+            return RegressionReport(scenario, len(runs), regressions)
+
+        for metric, current in sorted(metrics.items()):
+            values = [run[metric] for run in runs if metric in run]
+
+            if len(values) < self._min_runs:
+                continue
+
+            mean = statistics.mean(values)
+            stdev = statistics.stdev(values) if len(values) > 1 else 0.0
+
+            if metric.endswith(':time') and current - mean < self._min_time_delta:
+                continue
+
+            if current > mean + self._threshold * stdev and current > mean * (1 + self._tolerance):
+                regressions.append(Regression(metric, current, mean, stdev))
+
+        return RegressionReport(scenario, len(runs), regressions)
+
+    def check(self, scenario: str, metrics: Union[dict, Profiler]) -> RegressionReport:
+        """
+        Compares run with the baseline and records it
+        """
+        report = self.compare(scenario, metrics)
+        self.record(scenario, metrics)
+
+        return report
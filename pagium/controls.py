@@ -1,8 +1,17 @@
 # -*- coding: utf-8 -*-
 
+from typing import Union, Callable, Sequence
+
 from selenium.webdriver.remote.webelement import WebElement
 from selenium.common.exceptions import NoSuchElementException
 
+from pagium.webdriver import register_read_only_script
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 
 class Input(WebElement):
 
@@ -64,3 +73,232 @@ class Checkbox(WebElement):
     def uncheck(self):
         if self.is_checked():
             self.click()
+
+
+_TABLE_HEADERS_SCRIPT = """
+var table = arguments[0],
+    rowSelector = arguments[1],
+    cellSelector = arguments[2],
+    headerSelector = arguments[3];
+
+var text = function (element) {
+    return (element.innerText || element.textContent || '').trim();
+};
+
+var headers = Array.prototype.map.call(table.querySelectorAll(headerSelector), text),
+    rows = Array.prototype.slice.call(table.querySelectorAll(rowSelector));
+
+// tables without thead have header cells in the first row, it is not a data row
+if (!headers.length && rows.length) {
+    var cells = Array.prototype.slice.call(rows[0].querySelectorAll(cellSelector));
+
+    if (cells.length && cells.every(function (cell) { return cell.tagName === 'TH'; })) {
+        headers = cells.map(text);
+        rows.shift();
+    }
+}
+"""
+
+
+EXTRACT_TABLE_SCRIPT = register_read_only_script(_TABLE_HEADERS_SCRIPT + """
+var columns = headers.map(function () { return []; });
+
+rows.forEach(function (row, index) {
+    var cells = row.querySelectorAll(cellSelector);
+
+    while (columns.length < cells.length) {
+        headers.push(String(columns.length));
+        columns.push(new Array(index).fill(null));
+    }
+
+    columns.forEach(function (column, i) {
+        column.push(i < cells.length ? text(cells[i]) : null);
+    });
+});
+
+return [headers, columns];
+""")
+
+
+EXTRACT_HEADERS_SCRIPT = register_read_only_script(_TABLE_HEADERS_SCRIPT + """
+return headers;
+""")
+
+
+class TableData:
+    """
+    Columnar table data, filtering, sorting and row lookup are done locally
+
+    >>> data = TableData(['name', 'price'], [['b', 'a', 'c'], ['2', '1', '3']])
+
+    >>> len(data), data['price']
+    (3, ['2', '1', '3'])
+
+    >>> data.row('name', 'a')
+    {'name': 'a', 'price': '1'}
+
+    >>> data.sort('price', key=int).column('name')
+    ['a', 'b', 'c']
+
+    >>> data.filter(lambda row: int(row['price']) > 1).rows()
+    [{'name': 'b', 'price': '2'}, {'name': 'c', 'price': '3'}]
+
+    >>> data.filter(name='c').column('price')
+    ['3']
+
+    >>> TableData(['name', 'price'], [['b', 'a', 'c'], ['2', None, '1']]).sort('price').column('name')
+    ['c', 'b', 'a']
+    """
+
+    def __init__(self, headers: Sequence[str], columns: Sequence[Sequence]):
+        if len(headers) != len(columns):
+            raise AssertionError(
+                'Count of headers and columns must be equal',
+            )
+
+        self._headers = list(headers)
+        self._columns = [list(column) for column in columns]
+
+    def __len__(self):
+        return len(self._columns[0]) if self._columns else 0
+
+    def __getitem__(self, item: Union[str, int]) -> list:
+        return self.column(item)
+
+    def __iter__(self):
+        return iter(self.rows())
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__} {len(self)}x{len(self._headers)}: {self._headers}>'
+
+    @property
+    def headers(self) -> list:
+        return list(self._headers)
+
+    @property
+    def columns(self) -> dict:
+        return dict(zip(self._headers, self._columns))
+
+    def _index(self, column: Union[str, int]) -> int:
+        if isinstance(column, int):
+            return column
+
+        try:
+            return self._headers.index(column)
+        except ValueError:
+            raise KeyError(f'Column "{column}" was not found')
+
+    def _take(self, indexes: Sequence[int]) -> 'TableData':
+        return TableData(
+            self._headers, [[column[i] for i in indexes] for column in self._columns],
+        )
+
+    def column(self, column: Union[str, int]) -> list:
+        return self._columns[self._index(column)]
+
+    def rows(self) -> list:
+        return [dict(zip(self._headers, values)) for values in zip(*self._columns)]
+
+    def row(self, column: Union[str, int], value) -> dict:
+        try:
+            index = self.column(column).index(value)
+        except ValueError:
+            raise KeyError(f'Row with "{column}"="{value}" was not found')
+
+        return dict(zip(self._headers, (c[index] for c in self._columns)))
+
+    def filter(self, predicate: Callable = None, **values) -> 'TableData':
+        rows = self.rows()
+
+        return self._take([
+            i for i, row in enumerate(rows)
+            if (predicate is None or predicate(row)) and all(row[k] == v for k, v in values.items())
+        ])
+
+    def sort(self, column: Union[str, int], key: Callable = None, reverse: bool = False) -> 'TableData':
+        """
+        Empty cells of short rows (None) are sorted last
+        """
+        values = self.column(column)
+        sort_key = (lambda i: key(values[i])) if key is not None else values.__getitem__
+
+        indexes = [i for i, value in enumerate(values) if value is not None]
+        empty = [i for i, value in enumerate(values) if value is None]
+
+        return self._take(sorted(indexes, key=sort_key, reverse=reverse) + empty)
+
+    def to_numpy(self, dtypes: dict = None) -> dict:
+        """
+        Columns as numpy arrays for vectorized comparisons, numpy is optional dependency
+        """
+        if numpy is None:
+            raise AssertionError(
+                'numpy is required for array-backed table data, install it with "pip install numpy"',
+            )
+
+        dtypes = dtypes or {}
+
+        return {
+            header: numpy.asarray(column, dtype=dtypes.get(header))
+            for header, column in zip(self._headers, self._columns)
+        }
+
+
+class Table(WebElement):
+    """
+    Table extracted column by column with one driver command
+
+    >>> from pagium.webdriver import Remote
+    >>> from pagium.page import Page, PageElement
+    >>> from selenium.webdriver.common.by import By
+
+    >>> wd = Remote(
+    ... command_executor='http://localhost:4444/wd/hub',
+    ... desired_capabilities={'browserName': 'chrome'},
+    ... )
+
+    >>> class TablePage(Page):
+    ...     table = PageElement(Table, by=By.TAG_NAME, value='table')
+
+    >>> html = '<table><thead><tr><th>id</th><th>name</th></tr></thead>' \\
+    ...        '<tbody><tr><td>1</td><td>a</td></tr><tr><td>2</td><td>b</td></tr></tbody></table>'
+
+    >>> with TablePage(wd, 'data:text/html,' + html) as page:
+    ...     data = page.table.extract()
+
+    >>> data.row('id', '2')
+    {'id': '2', 'name': 'b'}
+
+    >>> with TablePage(wd, 'data:text/html,' + html) as page:
+    ...     headers = page.table.headers
+
+    >>> headers
+    ['id', 'name']
+
+    >>> html = '<table><tr><th>id</th><th>name</th></tr><tr><td>1</td><td>a</td></tr></table>'
+
+    >>> with TablePage(wd, 'data:text/html,' + html) as page:
+    ...     data = page.table.extract()
+
+    >>> data.rows()
+    [{'id': '1', 'name': 'a'}]
+
+    >>> wd.quit()
+    """
+
+    row_selector = ':scope > tbody > tr'
+    cell_selector = ':scope > th, :scope > td'
+    header_selector = ':scope > thead > tr > th'
+
+    @property
+    def headers(self) -> list:
+        return self.parent.execute_script(
+            EXTRACT_HEADERS_SCRIPT, self, self.row_selector, self.cell_selector, self.header_selector,
+        )
+
+    def extract(self) -> TableData:
+        headers, columns = self.parent.execute_script(
+            EXTRACT_TABLE_SCRIPT, self, self.row_selector, self.cell_selector, self.header_selector,
+        )
+
+        return TableData(headers, columns)
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+
+"""
+Locators compiled and validated once, when page element is defined.
+
+Native strategies are normalized to css selector where it is possible,
+custom strategies are compiled by registered selector engines.
+
+>>> compile_locator(By.ID, 'search')
+Locator(by='css selector', value='#search')
+
+>>> compile_locator(By.NAME, 'q')
+Locator(by='css selector', value='[name="q"]')
+
+>>> compile_locator('test-id', 'submit')
+Locator(by='css selector', value='[data-testid="submit"]')
+
+>>> compile_locator(By.XPATH, '//div[@id="a"')
+Traceback (most recent call last):
+...
+AssertionError: Invalid xpath locator "//div[@id="a"": unbalanced brackets or quotes
+
+>>> register_engine('placeholder', lambda value: Locator(By.CSS_SELECTOR, f'[placeholder={quote(value)}]'))
+
+>>> compile_locator('placeholder', 'Search')
+Locator(by='css selector', value='[placeholder="Search"]')
+"""
+
+import re
+from typing import Callable, NamedTuple
+
+from selenium.webdriver.common.by import By
+
+
+NATIVE_STRATEGIES = frozenset((
+    By.ID,
+    By.XPATH,
+    By.LINK_TEXT,
+    By.PARTIAL_LINK_TEXT,
+    By.NAME,
+    By.TAG_NAME,
+    By.CLASS_NAME,
+    By.CSS_SELECTOR,
+))
+
+_CSS_IDENTIFIER = re.compile(r'-?(?:[_a-zA-Z]|[^\x00-\x7f]|\\.)(?:[_a-zA-Z0-9-]|[^\x00-\x7f]|\\.)*')
+
+
+class Locator(NamedTuple):
+    by: str
+    value: str
+
+
+def quote(value: str) -> str:
+    """
+    Quoted string for css attribute selectors
+    """
+    return '"{}"'.format(value.replace('\\', '\\\\').replace('"', '\\"'))
+
+
+def xpath_literal(value: str) -> str:
+    if '"' not in value:
+        return f'"{value}"'
+
+    if "'" not in value:
+        return f"'{value}'"
+
+    parts = ', \'"\', '.join(f'"{part}"' for part in value.split('"'))
+    return f'concat({parts})'
+
+
+def _is_balanced(value: str, escapes: bool = False) -> bool:
+    r"""
+    >>> _is_balanced('[title="a\\"b"]', escapes=True)
+    True
+
+    >>> _is_balanced('#a\\(b', escapes=True)
+    True
+    """
+    pairs = {']': '[', ')': '('}
+    stack = []
+    quote_char = None
+    escaped = False
+
+    for char in value:
+        if escaped:
+            escaped = False
+        elif escapes and char == '\\':
+            escaped = True
+        elif quote_char is not None:
+            if char == quote_char:
+                quote_char = None
+        elif char in '"\'':
+            quote_char = char
+        elif char in '[(':
+            stack.append(char)
+        elif char in pairs:
+            if not stack or stack.pop() != pairs[char]:
+                return False
+
+    return not stack and quote_char is None
+
+
+def _validated(by: str, value: str) -> Locator:
+    if not _is_balanced(value, escapes=by == By.CSS_SELECTOR):
+        raise AssertionError(
+            f'Invalid {by.split()[0]} locator "{value}": unbalanced brackets or quotes',
+        )
+
+    return Locator(by, value)
+
+
+def _compile_id(value: str) -> Locator:
+    if '\\' not in value and _CSS_IDENTIFIER.fullmatch(value):
+        return Locator(By.CSS_SELECTOR, f'#{value}')
+
+    return Locator(By.CSS_SELECTOR, f'[id={quote(value)}]')
+
+
+def _compile_class_name(value: str) -> Locator:
+    """
+    >>> _compile_class_name('кнопка')
+    Locator(by='css selector', value='.кнопка')
+    """
+    if len(value.split()) > 1:
+        raise AssertionError(
+            f'Invalid class name locator "{value}", compound class names are not permitted',
+        )
+
+    if not _CSS_IDENTIFIER.fullmatch(value):
+        return Locator(By.CLASS_NAME, value)
+
+    return Locator(By.CSS_SELECTOR, f'.{value}')
+
+
+def _compile_tag_name(value: str) -> Locator:
+    if not _CSS_IDENTIFIER.fullmatch(value):
+        return Locator(By.TAG_NAME, value)
+
+    return Locator(By.CSS_SELECTOR, value)
+
+
+_engines = {
+    By.ID: _compile_id,
+    By.NAME: lambda value: Locator(By.CSS_SELECTOR, f'[name={quote(value)}]'),
+    By.CLASS_NAME: _compile_class_name,
+    By.TAG_NAME: _compile_tag_name,
+    By.CSS_SELECTOR: lambda value: _validated(By.CSS_SELECTOR, value),
+    By.XPATH: lambda value: _validated(By.XPATH, value),
+    By.LINK_TEXT: lambda value: Locator(By.LINK_TEXT, value),
+    By.PARTIAL_LINK_TEXT: lambda value: Locator(By.PARTIAL_LINK_TEXT, value),
+    'text': lambda value: Locator(By.XPATH, f'.//*[normalize-space(text())={xpath_literal(value)}]'),
+    'role': lambda value: Locator(By.CSS_SELECTOR, f'[role={quote(value)}]'),
+    'test-id': lambda value: Locator(By.CSS_SELECTOR, f'[data-testid={quote(value)}]'),
+}
+
+
+def register_engine(name: str, compiler: Callable[[str], Locator]):
+    """
+    Registers selector engine, compiler gets locator value and
+    returns locator with native strategy
+    """
+    if name in NATIVE_STRATEGIES:
+        raise AssertionError(f'Native strategy "{name}" can not be overridden')
+
+    _engines[name] = compiler
+
+
+def compile_locator(by: str, value: str) -> Locator:
+    engine = _engines.get(by)
+
+    if engine is None:
+        raise AssertionError(
+            f'Unknown locator strategy "{by}", use one of: {", ".join(sorted(_engines))}',
+        )
+
+    if not isinstance(value, str) or not value.strip():
+        raise AssertionError(f'Locator value for "{by}" strategy must be non-empty string')
+
+    locator = engine(value)
+
+    if locator.by not in NATIVE_STRATEGIES:
+        raise AssertionError(
+            f'Selector engine "{by}" must compile locator to native strategy, got "{locator.by}"',
+        )
+
+    return locator
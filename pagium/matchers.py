@@ -8,7 +8,8 @@ from hamcrest.core.base_matcher import BaseMatcher
 from selenium.webdriver.remote.webelement import WebElement
 
 from pagium import utils
-from pagium.page import Page, LazyWebElement
+from pagium.page import Page, LazyWebElement, LazyWebElementItem
+from pagium.text import TextSnapshot, search_text, match_text
 
 
 DEFAULT_TIMEOUT = 30
@@ -24,12 +25,54 @@ class _BasePagiumMatcher(BaseMatcher):
     def __matches__(self, *args, **kwargs):
         pass
 
-    def _matches(self, *args, **kwargs):
-        return utils.waiting_for(
-            self.__matches__, args=args, kwargs=kwargs,
-            timeout=self.timeout, delay=self.delay,
+    def _condition(self) -> Union[tuple, None]:
+        """
+        Params of the condition, matchers with equal conditions
+        share one polling loop for the same item
+        """
+        return None
+
+    def _result_state(self) -> dict:
+        """
+        State of the last check for describe_mismatch,
+        it is copied from the owner of the shared polling loop
+        """
+        return {}
+
+    def _waiters(self, item):
+        condition = self._condition()
+
+        if condition is None:
+            return None, None
+
+        try:
+            waiters = utils.get_driver(item).waiters
+            key = (self.__class__, condition, _item_key(item))
+            hash(key)
+        except (AttributeError, TypeError):
+            return None, None
+
+        return waiters, key
+
+    def _matches(self, item):
+        waiters, key = self._waiters(item)
+
+        if waiters is None:
+            return utils.waiting_for(
+                self.__matches__, args=(item,),
+                timeout=self.timeout, delay=self.delay,
+            )
+
+        result, owner = waiters.wait(
+            key, self.__matches__, args=(item,),
+            timeout=self.timeout, delay=self.delay, owner=self,
         )
 
+        if owner is not self:
+            self.__dict__.update(owner._result_state())
+
+        return result
+
     def _create_message(self, text, **params):
         params.update(timeout=self.timeout, delay=self.delay)
         params_string = ', '.join(f'{k}={v}' for k, v in params.items())
@@ -37,17 +80,45 @@ class _BasePagiumMatcher(BaseMatcher):
         return f'{text} ({params_string})'
 
 
-class _HasText(_BasePagiumMatcher):
+def _item_key(item) -> tuple:
+    if isinstance(item, LazyWebElement):
+        index = item.index if isinstance(item, LazyWebElementItem) else None
+        return id(item.page_element), index, _item_key(item.parent), item.window
+
+    if isinstance(item, Page) and item.window is None:
+        return _item_key(item.parent)
+
+    if isinstance(item, Page):
+        return id(item.parent), item.window
+
+    return id(item),
+
+
+class _BaseTextMatcher(_BasePagiumMatcher):
+
+    def _matches(self, item):
+        if isinstance(item, TextSnapshot):
+            return self.__matches__(item)
+
+        return super(_BaseTextMatcher, self)._matches(item)
+
+
+class _HasText(_BaseTextMatcher):
 
     def __init__(self, text: str, **kwargs):
         super(_HasText, self).__init__(**kwargs)
         self.text = text
+        self.actual_text = None
 
-    def __matches__(self, instance: Union[Page, WebElement, LazyWebElement]):
-        if isinstance(instance, LazyWebElement):
-            instance.refresh()
-        self.actual_text = instance.text
-        return str(self.text).lower() in str(self.actual_text).lower()
+    def _condition(self):
+        return self.text,
+
+    def _result_state(self):
+        return {'actual_text': self.actual_text}
+
+    def __matches__(self, instance: Union[Page, WebElement, LazyWebElement, TextSnapshot]):
+        found, self.actual_text = search_text(instance, self.text)
+        return found
 
     def describe_to(self, description):
         description.append_text(
@@ -68,6 +139,9 @@ class _ElementExists(_BasePagiumMatcher):
 
         self.count = count
 
+    def _condition(self):
+        return self.count,
+
     def __matches__(self, lazy_web_element: LazyWebElement):
         driver = utils.get_driver(lazy_web_element.parent)
 
@@ -98,6 +172,9 @@ class _ElementNotExists(_BasePagiumMatcher):
 
         self.count = count
 
+    def _condition(self):
+        return self.count,
+
     def __matches__(self, lazy_web_element: LazyWebElement):
         driver = utils.get_driver(lazy_web_element.parent)
 
@@ -129,6 +206,12 @@ class _URLPathEqual(_BasePagiumMatcher):
         self.url_path = url_path
         self.current_path = None
 
+    def _condition(self):
+        return self.url_path,
+
+    def _result_state(self):
+        return {'current_path': self.current_path}
+
     def __matches__(self, browser):
         self.current_path = urlparse(browser.current_url).path
         return self.url_path == self.current_path
@@ -153,6 +236,12 @@ class _URLPathContains(_BasePagiumMatcher):
         self.url_path_part = url_path_part
         self.current_path = None
 
+    def _condition(self):
+        return self.url_path_part,
+
+    def _result_state(self):
+        return {'current_path': self.current_path}
+
     def __matches__(self, browser):
         self.current_path = urlparse(browser.current_url).path
         return self.url_path_part in self.current_path
@@ -169,18 +258,23 @@ class _URLPathContains(_BasePagiumMatcher):
 url_path_contains = _URLPathContains
 
 
-class _MatchRegexp(_BasePagiumMatcher):
+class _MatchRegexp(_BaseTextMatcher):
 
     def __init__(self, regexp, **kwargs):
         super(_MatchRegexp, self).__init__(**kwargs)
 
         self.pattern = re.compile(regexp)
+        self.text = None
+
+    def _condition(self):
+        return self.pattern.pattern, self.pattern.flags
 
-    def __matches__(self, instance):
-        if instance(instance, LazyWebElement):
-            instance.refresh()
-        self.text = instance.text
-        return self.pattern.search(self.text) is not None
+    def _result_state(self):
+        return {'text': self.text}
+
+    def __matches__(self, instance: Union[Page, WebElement, LazyWebElement, TextSnapshot]):
+        found, self.text = match_text(instance, self.pattern)
+        return found
 
     def describe_to(self, description):
         description.append_text(
@@ -201,6 +295,9 @@ class _TagAttributeEqual(_BasePagiumMatcher):
         self.attribute_name = attribute_name
         self.value = value
 
+    def _condition(self):
+        return self.attribute_name, self.value
+
     def __matches__(self, we: Union[WebElement, LazyWebElement]):
         return we.get_attribute(self.attribute_name) == self.value
 
@@ -44,18 +44,27 @@
 """
 
 from typing import Union, Callable
+from inspect import getattr_static
+from functools import wraps
 from urllib.parse import urljoin
 
-from selenium.common.exceptions import WebDriverException
+from selenium.common.exceptions import (
+    WebDriverException,
+    NoSuchElementException,
+    StaleElementReferenceException,
+)
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.remote.webelement import WebElement
 
+from pagium import utils
+from pagium.locators import Locator, compile_locator
+
 
 class Page:
 
     __path__ = None
 
-    def __init__(self, parent: Union[WebDriver, WebElement], url: str, **options):
+    def __init__(self, parent: Union[WebDriver, WebElement], url: str, *, window: str = None, **options):
         """
         >>> assert Page(object, 'http://google.com').url ==  'http://google.com'
 
@@ -69,10 +78,13 @@ class Page:
         >>> assert TestPage(object, '').parent == object
 
         >>> assert 'test' in TestPage(object, '', test=1).options
+
+        >>> assert TestPage(object, '', window='handle').window == 'handle'
         """
         self._url = url
 
         self._parent = parent
+        self._window = window
         self._options = options
 
     def __enter__(self):
@@ -83,7 +95,18 @@ class Page:
         self.close()
 
     def __getattr__(self, item):
-        return getattr(self._parent, item)
+        with self._bound_window():
+            attr = getattr(self._parent, item)
+
+        if self._window is not None and callable(attr):
+            @wraps(attr)
+            def wrapped(*args, **kwargs):
+                with self._bound_window():
+                    return attr(*args, **kwargs)
+
+            return wrapped
+
+        return attr
 
     def __repr__(self):
         return f'<{self.__class__.__name__} on {self.url}>'
@@ -96,11 +119,16 @@ class Page:
     def options(self):
         return self._options
 
+    @property
+    def window(self):
+        return self._window
+
     @property
     def text(self) -> str:
-        if isinstance(self._parent, WebDriver):
-            return str(self._parent.find_element_by_tag_name('body').text)
-        return str(self._parent.text)
+        with self._bound_window():
+            if isinstance(self._parent, WebDriver):
+                return str(self._parent.find_element_by_tag_name('body').text)
+            return str(self._parent.text)
 
     @property
     def url(self):
@@ -113,9 +141,20 @@ class Page:
 
         return self._url
 
+    def activate(self):
+        """
+        Switches driver to the window of the page if the page is bound to window
+        """
+        if self._window is not None:
+            utils.activate_window(utils.get_driver(self._parent), self._window)
+
+    def _bound_window(self):
+        return utils.bound_window(utils.get_driver(self._parent), self._window)
+
     def open(self):
         if isinstance(self._parent, WebDriver):
-            self._parent.get(self.url)
+            with self._bound_window():
+                self._parent.get(self.url)
         else:
             raise AssertionError(
                 'Can not open page because parent is not instance of WebDriver object',
@@ -132,7 +171,8 @@ class PageElement:
                  by: str = None,
                  value: str = None,
                  is_list: bool = False,
-                 hook: Callable = None):
+                 hook: Callable = None,
+                 key: Callable = None):
         if we_class is not None:
             if not issubclass(we_class, WebElement):
                 raise AssertionError(
@@ -149,24 +189,45 @@ class PageElement:
         self._value = value
         self._is_list = is_list
         self._hook = hook
+        self._key = key
+        self._name = None
+
+        self._locator = None
+
+        if by is not None or value is not None:
+            self._locator = compile_locator(by, value)
 
     def __repr__(self):
         we_class = self._we_class or WebElement
         return f'{we_class.__name__}: {self._by}={self._value} '
 
+    def __set_name__(self, owner: type, name: str):
+        self._name = f'{owner.__name__}.{name}'
+
     def __get__(self, instance: Union[Page, WebElement], owner: type):
         parent = instance
+        window = None
 
         if isinstance(instance, Page):
-            parent = instance.parent
+            parent, window = instance.parent, instance.window
+        elif isinstance(instance, LazyWebElement):
+            window = instance.window
 
-        lazy_web_element = LazyWebElement(self, parent)
+        lazy_web_element = LazyWebElement(self, parent, window=window)
 
         if callable(self._hook):
             return self._hook(lazy_web_element)
 
         return lazy_web_element
 
+    @property
+    def name(self):
+        return self._name or repr(self).strip()
+
+    @property
+    def locator(self) -> Union[Locator, None]:
+        return self._locator
+
     @property
     def by(self):
         return self._by
@@ -183,8 +244,12 @@ class PageElement:
     def is_list(self):
         return self._is_list
 
+    @property
+    def key(self):
+        return self._key
+
     def get(self, parent: Union[WebDriver, WebElement]) -> Union[WebElement, list]:
-        if self._by is None and self._value is None:
+        if self._locator is None:
             if self._we_class is None:
                 raise AssertionError(
                     'Can not create web element container, use "we_type" param for resolve it',
@@ -196,13 +261,13 @@ class PageElement:
             return container
 
         if self._is_list:
-            web_element = parent.find_elements(by=self._by, value=self._value)
+            web_element = parent.find_elements(*self._locator)
 
             if self._we_class is not None:
                 for we in web_element:
                     we.__class__ = self._we_class
         else:
-            web_element = parent.find_element(by=self._by, value=self._value)
+            web_element = parent.find_element(*self._locator)
 
             if self._we_class is not None:
                 web_element.__class__ = self._we_class
@@ -211,43 +276,172 @@ class PageElement:
 
 
 class LazyWebElement:
+    """
+    Web element proxy which re-resolves itself through the page element
+    locator chain and retries the operation once, when the cached web
+    element has gone stale after a DOM re-render.
+
+    >>> from pagium.webdriver import Remote
+    >>> from selenium.webdriver.common.by import By
+
+    >>> wd = Remote(
+    ... command_executor='http://localhost:4444/wd/hub',
+    ... desired_capabilities={'browserName': 'chrome'},
+    ... )
 
-    def __init__(self, element: PageElement, parent: Union[WebDriver, WebElement]):
+    >>> class RerenderPage(Page):
+    ...     title = PageElement(by=By.TAG_NAME, value='h1')
+    ...     items = PageElement(by=By.TAG_NAME, value='li', is_list=True)
+
+    >>> with RerenderPage(wd, 'data:text/html,<h1>a</h1><ul><li>b</li></ul>') as page:
+    ...     title, item = page.title, page.items[0]
+    ...     assert title.text == 'a' and item.text == 'b'
+    ...     page.execute_script('document.body.innerHTML = document.body.innerHTML')
+    ...     assert title.text == 'a' and item.text == 'b'
+
+    >>> wd.quit()
+    """
+
+    def __init__(self, element: PageElement, parent: Union[WebDriver, WebElement], *, window: str = None):
         self._page_element = element
         self._parent = parent
+        self._window = window
         self._web_element = None
+        self._key_cache = {}
 
     def __repr__(self):
         self._search()
-        return f'{self.__class__.__name__} -> {repr(self._web_element)}'
+        return f'{type(self).__name__} -> {repr(self._web_element)}'
 
     def __iter__(self):
         self._search()
+
+        if self.is_list:
+            return iter([self._item(i, we) for i, we in enumerate(self._web_element)])
+
         return iter(self._web_element)
 
     def __getattr__(self, item):
         self._search()
-        return getattr(self._web_element, item)
+
+        if not self.is_list:
+            descriptor = getattr_static(self._web_element, item, None)
+
+            if isinstance(descriptor, PageElement):
+                return descriptor.__get__(self, type(self._web_element))
+
+        if self.is_list or not self._is_driver_call(item):
+            with self._bound_window():
+                attr = getattr(self._web_element, item)
+
+            if self._window is not None and callable(attr):
+                @wraps(attr)
+                def wrapped(*args, **kwargs):
+                    with self._bound_window():
+                        return attr(*args, **kwargs)
+
+                return wrapped
+
+            return attr
+
+        attr = self._heal(lambda: getattr(self._web_element, item))
+
+        if callable(attr):
+            @wraps(attr)
+            def wrapped(*args, **kwargs):
+                return self._heal(lambda: getattr(self._web_element, item)(*args, **kwargs))
+
+            return wrapped
+
+        return attr
 
     def __getitem__(self, item):
         self._search()
+
+        if self.is_list and isinstance(item, int):
+            return self._item(item, self._web_element[item])
+
         return self._web_element.__getitem__(item)
 
     def __len__(self):
         self._search()
-        if self._page_element.is_list:
+        if self.is_list:
             return self._web_element.__len__()
 
         return 1
 
+    def _item(self, index: int, web_element: WebElement):
+        if index < 0:
+            index += len(self._web_element)
+
+        return LazyWebElementItem(
+            self._page_element, self._parent, index, web_element,
+            window=self._window, key_cache=self._key_cache,
+        )
+
     def _search(self):
-        if self._web_element is None:
-            self._web_element = self._page_element.get(self._parent)
+        lifecycle = getattr(utils.get_driver(self._parent), 'lifecycle', None)
+
+        if lifecycle is not None:
+            lifecycle.tick()
+
+        resolved = self._web_element is None
+
+        if resolved:
+            with self._bound_window():
+                self._web_element = self._resolve()
+
+        if lifecycle is not None:
+            lifecycle.touch(self, resolved=resolved)
+
+    def _resolve(self) -> Union[WebElement, list]:
+        return self._page_element.get(self._parent)
+
+    def _bound_window(self):
+        return utils.bound_window(utils.get_driver(self._parent), self._window)
+
+    def _is_driver_call(self, item: str) -> bool:
+        """
+        Only single driver calls of selenium web element are retried,
+        methods of web element subclasses can be not idempotent
+        """
+        for cls in type(self._web_element).__mro__:
+            if item in cls.__dict__:
+                return cls is WebElement
+
+        return False
+
+    def _heal(self, callback: Callable):
+        with self._bound_window():
+            try:
+                return callback()
+            except StaleElementReferenceException:
+                self.refresh()
+                self._search()
+
+            return callback()
 
     @property
     def parent(self):
         return self._parent
 
+    @property
+    def page_element(self):
+        return self._page_element
+
+    @property
+    def window(self):
+        return self._window
+
+    @property
+    def web_element(self) -> Union[WebElement, list]:
+        self._search()
+        return self._web_element
+
+    @property
+    def is_list(self):
+        return self._page_element.is_list
+
     def exists(self, count: int = 1) -> bool:
         self.refresh()
 
@@ -256,10 +450,90 @@ class LazyWebElement:
         except WebDriverException:
             return False
 
-        if self._page_element.is_list:
+        if self.is_list:
             return len(self._web_element) >= count
 
-        return self._web_element.is_displayed()
+        return self._heal(lambda: self._web_element.is_displayed())
 
     def refresh(self):
         self._web_element = None
+
+
+class LazyWebElementItem(LazyWebElement):
+    """
+    Single item of the list page element. Stale item is re-mapped by
+    the page element "key" callback value if it is set, by index otherwise.
+    Keys are memoized by web element id and shared by items of one list.
+
+    Item is an instance of the web element class of the page element,
+    so it can be checked by isinstance and passed to execute_script.
+
+    >>> item = LazyWebElementItem(PageElement(by='css selector', value='li', is_list=True), None, 0)
+
+    >>> isinstance(item, WebElement)
+    True
+    """
+
+    def __init__(self,
+                 element: PageElement,
+                 parent: Union[WebDriver, WebElement],
+                 index: int,
+                 web_element: WebElement = None,
+                 *,
+                 window: str = None,
+                 key_cache: dict = None):
+        super(LazyWebElementItem, self).__init__(element, parent, window=window)
+
+        self._index = index
+        self._web_element = web_element
+        self._key = None
+
+        if key_cache is not None:
+            self._key_cache = key_cache
+
+        if callable(element.key):
+            self._search()
+            self._key = self._key_of(self._web_element)
+
+    @property
+    def __class__(self):
+        return self._page_element.we_class or WebElement
+
+    def _key_of(self, web_element: WebElement):
+        try:
+            return self._key_cache[web_element.id]
+        except KeyError:
+            key = self._key_cache[web_element.id] = self._page_element.key(web_element)
+            return key
+
+    def _resolve(self) -> WebElement:
+        web_elements = self._page_element.get(self._parent)
+
+        if self._key is not None:
+            ids = {we.id for we in web_elements}
+
+            for stale_id in set(self._key_cache) - ids:
+                self._key_cache.pop(stale_id, None)
+
+            for we in web_elements:
+                if self._key_of(we) == self._key:
+                    return we
+
+            raise NoSuchElementException(
+                f'List item with key "{self._key}" was not found',
+            )
+
+        try:
+            return web_elements[self._index]
+        except IndexError:
+            raise NoSuchElementException(
+                f'List item with index "{self._index}" was not found',
+            )
+
+    @property
+    def is_list(self):
+        return False
+
+    @property
+    def index(self):
+        return self._index
@@ -0,0 +1,298 @@
+# -*- coding: utf-8 -*-
+
+"""
+Opt-in profiler which attributes wall time and driver commands
+to pages, page elements, hooks and matchers.
+
+>>> from pagium.webdriver import Remote
+>>> from pagium.page import Page, PageElement
+>>> from selenium.webdriver.common.by import By
+
+>>> wd = Remote(
+... command_executor='http://localhost:4444/wd/hub',
+... desired_capabilities={'browserName': 'chrome'},
+... )
+
+>>> class ProfiledPage(Page):
+...     title = PageElement(by=By.TAG_NAME, value='h1')
+
+>>> profiler = Profiler()
+
+>>> with profiler.enable():
+...     with ProfiledPage(wd, 'data:text/html,<h1>title</h1>') as page:
+...         assert page.title.text == 'title'
+
+>>> assert profiler.root.commands >= 3
+
+>>> assert 'ProfiledPage.open;execute get' in profiler.folded()
+
+>>> wd.quit()
+"""
+
+import time
+import inspect
+import threading
+from functools import wraps
+from typing import Union, Callable, Iterator
+from contextlib import contextmanager
+
+from pagium.page import Page, PageElement, LazyWebElement
+from pagium.hooks import BasePageElementHook
+from pagium.matchers import _BasePagiumMatcher
+from pagium.webdriver import WEbDriverPollingMixin
+
+
+def _subclasses(cls: type) -> Iterator[type]:
+    yield cls
+
+    for subclass in cls.__subclasses__():
+        yield from _subclasses(subclass)
+
+
+def _page_method_name(attr: str) -> Callable:
+    return lambda page, *a, **kw: f'{page.__class__.__name__}.{attr}'
+
+
+def _class_targets(cls: type) -> Iterator[tuple]:
+    if issubclass(cls, Page):
+        for attr, value in list(cls.__dict__.items()):
+            if inspect.isfunction(value) and not attr.startswith('_'):
+                yield attr, _page_method_name(attr), False
+
+    if issubclass(cls, BasePageElementHook) and '__call__' in cls.__dict__:
+        yield '__call__', lambda hook, *a, **kw: f'hook {hook.__class__.__name__}', False
+
+    if issubclass(cls, _BasePagiumMatcher) and '_matches' in cls.__dict__:
+        yield '_matches', lambda matcher, *a, **kw: f'match {matcher.__class__.__name__.lstrip("_")}', False
+
+
+_SUBCLASSED = (Page, BasePageElementHook, _BasePagiumMatcher)
+
+_TARGETS = (
+    (PageElement, '__get__', lambda pe, instance, owner: f'get {pe.name}', False),
+    (LazyWebElement, '_search', lambda lwe: f'search {lwe.page_element.name}', False),
+    (WEbDriverPollingMixin, 'execute', lambda wd, command, params=None: f'execute {command}', True),
+)
+
+_lock = threading.RLock()
+_active = ()
+_patched = []
+
+
+def _wrap(f: Callable, name: Callable, is_command: bool):
+    @wraps(f)
+    def wrapped(*args, **kwargs):
+        profilers = _active
+
+        if not profilers:
+            return f(*args, **kwargs)
+
+        node_name = name(*args, **kwargs)
+        entered = [(p, p._enter(node_name, is_command)) for p in profilers]
+        t_start = time.perf_counter()
+
+        try:
+            return f(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - t_start
+
+            for p, node in entered:
+                if node is not None:
+                    p._exit(node, elapsed)
+
+    return wrapped
+
+
+def _patch(owner: type, attr: str, name: Callable, is_command: bool):
+    original = owner.__dict__[attr]
+    _patched.append((owner, attr, original))
+    setattr(owner, attr, _wrap(original, name, is_command))
+
+
+def _patch_class(cls: type):
+    with _lock:
+        if _active:
+            for attr, name, is_command in _class_targets(cls):
+                _patch(cls, attr, name, is_command)
+
+
+def _init_subclass_hook(base: type) -> classmethod:
+    def init_subclass(cls, **kwargs):
+        super(base, cls).__init_subclass__(**kwargs)
+        _patch_class(cls)
+
+    return classmethod(init_subclass)
+
+
+def _install():
+    for owner, attr, name, is_command in _TARGETS:
+        _patch(owner, attr, name, is_command)
+
+    for base in _SUBCLASSED:
+        for cls in _subclasses(base):
+            for attr, name, is_command in _class_targets(cls):
+                _patch(cls, attr, name, is_command)
+
+        _patched.append((base, '__init_subclass__', base.__dict__.get('__init_subclass__')))
+        base.__init_subclass__ = _init_subclass_hook(base)
+
+
+def _uninstall():
+    while _patched:
+        owner, attr, original = _patched.pop()
+
+        if original is None:
+            delattr(owner, attr)
+        else:
+            setattr(owner, attr, original)
+
+
+class ProfileNode:
+
+    def __init__(self, name: str, parent: 'ProfileNode' = None):
+        self.name = name
+        self.parent = parent
+        self.children = {}
+
+        self.calls = 0
+        self.total = 0.0
+        self.commands = 0
+
+    def __repr__(self):
+        return (
+            f'<{self.__class__.__name__} {self.name}: calls={self.calls}, '
+            f'total={self.total:.6f}, self={self.self_time:.6f}, commands={self.commands}>'
+        )
+
+    def __iter__(self):
+        return iter(self.children.values())
+
+    @property
+    def self_time(self) -> float:
+        return max(self.total - sum(child.total for child in self), 0.0)
+
+    @property
+    def self_commands(self) -> int:
+        return self.commands - sum(child.commands for child in self)
+
+    @property
+    def path(self) -> list:
+        node, path = self, []
+
+        while node.parent is not None:
+            path.append(node.name)
+            node = node.parent
+
+        return path[::-1]
+
+    def child(self, name: str) -> 'ProfileNode':
+        node = self.children.get(name)
+
+        if node is None:
+            node = self.children.setdefault(name, ProfileNode(name, self))
+
+        return node
+
+    def walk(self) -> Iterator['ProfileNode']:
+        yield self
+
+        for child in self:
+            yield from child.walk()
+
+
+class Profiler:
+
+    def __init__(self):
+        self.root = ProfileNode('root')
+        self._local = threading.local()
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__} total={self.root.total:.6f}, commands={self.root.commands}>'
+
+    @property
+    def _stack(self) -> list:
+        stack = getattr(self._local, 'stack', None)
+
+        if stack is None:
+            stack = self._local.stack = [self.root]
+
+        return stack
+
+    def _enter(self, name: str, is_command: bool) -> Union[ProfileNode, None]:
+        stack = self._stack
+
+        if not is_command and stack[-1].name == name:
+            return None
+
+        node = stack[-1].child(name)
+        stack.append(node)
+
+        if is_command:
+            for n in stack:
+                n.commands += 1
+
+        return node
+
+    def _exit(self, node: ProfileNode, elapsed: float):
+        stack = self._stack
+
+        node.calls += 1
+        node.total += elapsed
+        stack.pop()
+
+        if len(stack) == 1:
+            self.root.total += elapsed
+
+    @contextmanager
+    def enable(self):
+        """
+        Profilers can be enabled together and disabled in any order,
+        classes are patched while at least one profiler is enabled
+        """
+        global _active
+
+        with _lock:
+            if self in _active:
+                raise AssertionError('Profiler is enabled already')
+
+            if not _active:
+                _active = (self,)
+                _install()
+            else:
+                _active += (self,)
+
+        try:
+            yield self
+        finally:
+            self.disable()
+
+    def disable(self):
+        global _active
+
+        with _lock:
+            if self not in _active:
+                return
+
+            _active = tuple(p for p in _active if p is not self)
+
+            if not _active:
+                _uninstall()
+
+    def reset(self):
+        self.root = ProfileNode('root')
+        self._local = threading.local()
+
+    def folded(self) -> str:
+        """
+        Folded stacks of self time in microseconds for flamegraph tools
+        """
+        lines = []
+
+        for node in self.root.walk():
+            microseconds = int(node.self_time * 1000000)
+
+            if node.parent is not None and microseconds:
+                path = ';'.join(name.replace(';', ',') for name in node.path)
+                lines.append(f'{path} {microseconds}')
+
+        return '\n'.join(lines)
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+
+"""
+Lifecycle management of lazy web elements for long-running sessions.
+
+Lazy web elements are tracked by weak references only. Resolved elements
+are kept in LRU order, the least recently used ones drop their web element
+reference when the cache size is exceeded. All references can be
+released periodically, they are resolved again on next use.
+
+>>> from pagium.webdriver import Remote
+>>> from pagium.page import Page, PageElement
+>>> from selenium.webdriver.common.by import By
+
+>>> wd = Remote(
+... command_executor='http://localhost:4444/wd/hub',
+... desired_capabilities={'browserName': 'chrome'},
+... max_cached_elements=1,
+... release_interval=60,
+... )
+
+>>> class SoakPage(Page):
+...     first = PageElement(by=By.TAG_NAME, value='h1')
+...     second = PageElement(by=By.TAG_NAME, value='p')
+
+>>> with SoakPage(wd, 'data:text/html,<h1>a</h1><p>b</p>') as page:
+...     first, second = page.first, page.second
+...     assert first.text == 'a' and second.text == 'b'
+
+>>> assert wd.lifecycle.stats()['cached'] == 1
+
+>>> assert wd.lifecycle.stats()['evicted'] == 1
+
+>>> wd.quit()
+"""
+
+import time
+import weakref
+from typing import Union
+from collections import OrderedDict
+
+
+BROWSER_HEAP_SCRIPT = """
+var memory = window.performance && window.performance.memory;
+return memory ? memory.usedJSHeapSize : null;
+"""
+
+
+class SessionLifecycle:
+
+    def __init__(self, max_elements: int = None, release_interval: Union[int, float] = None):
+        self._max_elements = max_elements
+        self._release_interval = release_interval
+
+        self._tracked = weakref.WeakSet()
+        self._cached = OrderedDict()
+
+        self._t_release = time.time()
+
+        self._resolved_count = 0
+        self._evicted_count = 0
+        self._released_count = 0
+
+    def __repr__(self):
+        params_string = ', '.join(f'{k}={v}' for k, v in self.stats().items())
+        return f'<{self.__class__.__name__} {params_string}>'
+
+    @property
+    def max_elements(self):
+        return self._max_elements
+
+    @property
+    def release_interval(self):
+        return self._release_interval
+
+    def track(self, lazy_web_element):
+        self._tracked.add(lazy_web_element)
+
+    def touch(self, lazy_web_element, resolved: bool = False):
+        """
+        Marks element as recently used, evicts least recently used
+        elements if the cache size is exceeded
+        """
+        key = id(lazy_web_element)
+        self.track(lazy_web_element)
+
+        if key in self._cached:
+            self._cached.move_to_end(key)
+        else:
+            self._cached[key] = weakref.ref(lazy_web_element, lambda ref: self._forget(key, ref))
+
+        if resolved:
+            self._resolved_count += 1
+
+        while self._max_elements is not None and len(self._cached) > self._max_elements:
+            _, ref = self._cached.popitem(last=False)
+            evicted = ref()
+
+            if evicted is not None:
+                evicted.refresh()
+                self._evicted_count += 1
+
+    def _forget(self, key: int, ref: weakref.ref):
+        if self._cached.get(key) is ref:
+            del self._cached[key]
+
+    def tick(self):
+        """
+        Releases all element references if release interval is elapsed
+        """
+        if self._release_interval is not None and time.time() - self._t_release >= self._release_interval:
+            self.release()
+
+    def release(self):
+        for lazy_web_element in list(self._tracked):
+            lazy_web_element.refresh()
+
+        self._released_count += len(self._cached)
+        self._cached.clear()
+        self._t_release = time.time()
+
+    def stats(self) -> dict:
+        return {
+            'tracked': len(self._tracked),
+            'cached': len(self._cached),
+            'resolved': self._resolved_count,
+            'evicted': self._evicted_count,
+            'released': self._released_count,
+        }
+
+    @staticmethod
+    def browser_heap(driver) -> Union[int, None]:
+        """
+        Used javascript heap size of the page in bytes if browser reports it
+        """
+        return driver.execute_script(BROWSER_HEAP_SCRIPT)
@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+
+"""
+Text search for pages and web elements.
+
+Search is executed by the browser, so only a boolean flag and a short
+context snippet are transferred instead of the whole element text.
+Only visible text is searched, the same as WebElement.text returns.
+Use TextSnapshot for checking many texts against one state of the page,
+the text is fetched and normalized only once in this case.
+
+>>> snapshot = TextSnapshot('Hello   World\\nfrom pagium')
+
+>>> snapshot.normalized
+'hello world from pagium'
+
+>>> snapshot.search('WORLD FROM')
+(True, 'Hello World from pagium')
+
+>>> snapshot.match(re.compile(r'p\\w+'))
+(True, 'Hello   World\\nfrom pagium')
+
+>>> snapshot.search('selenium')
+(False, 'Hello World from pagium')
+"""
+
+import re
+from typing import Union, Pattern, Tuple
+
+from selenium.common.exceptions import StaleElementReferenceException
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
+
+from pagium import utils
+from pagium.page import Page, LazyWebElement
+from pagium.webdriver import register_read_only_script
+
+
+SNIPPET_SIZE = 40
+
+
+SEARCH_TEXT_SCRIPT = register_read_only_script("""
+var element = arguments[0] || document.body,
+    needle = arguments[1],
+    flags = arguments[2],
+    size = arguments[3];
+
+// not rendered elements have no visible text, as for WebElement.text,
+// which also returns non-breaking spaces as plain spaces
+var text = element.getClientRects().length ? (element.innerText || '').replace(/\\u00a0/g, ' ') : '',
+    start = -1,
+    length = 0;
+
+if (flags === null) {
+    text = text.replace(/\\s+/g, ' ').trim();
+    start = text.toLowerCase().indexOf(needle);
+    length = needle.length;
+} else {
+    var match = new RegExp(needle, flags).exec(text);
+
+    if (match) {
+        start = match.index;
+        length = match[0].length;
+    }
+}
+
+if (start < 0) {
+    return [false, text.slice(0, size * 2)];
+}
+
+return [true, text.slice(Math.max(0, start - size), start + length + size)];
+""")
+
+
+_JS_REGEXP_FLAGS = {
+    re.IGNORECASE: 'i',
+    re.MULTILINE: 'm',
+    re.DOTALL: 's',
+}
+
+_PY_ONLY_REGEXP_SYNTAX = re.compile(r'\(\?[P#aiLmsux]|\\[AZwWdDbB]|\{,')
+
+
+def normalize(text: str) -> str:
+    return ' '.join(str(text).split()).lower()
+
+
+def _snippet(text: str, start: int, length: int, size: int = SNIPPET_SIZE) -> str:
+    if start < 0:
+        return text[:size * 2]
+
+    return text[max(0, start - size):start + length + size]
+
+
+def _js_flags(pattern: Pattern) -> Union[str, None]:
+    r"""
+    Flags of the javascript regular expression, None if the pattern
+    can not be matched by the browser with the same semantics,
+    e.g. \w, \d and \b are ASCII-only in javascript
+
+    >>> _js_flags(re.compile('price: 5', re.IGNORECASE))
+    'i'
+
+    >>> _js_flags(re.compile(r'\w+')) is None
+    True
+
+    >>> _js_flags(re.compile('a{,3}')) is None
+    True
+    """
+    flags = pattern.flags & ~(re.UNICODE | re.ASCII)
+    js_flags = ''
+
+    for flag, js_flag in _JS_REGEXP_FLAGS.items():
+        if flags & flag:
+            js_flags += js_flag
+            flags &= ~flag
+
+    if flags or not isinstance(pattern.pattern, str):
+        return None
+
+    if _PY_ONLY_REGEXP_SYNTAX.search(pattern.pattern):
+        return None
+
+    return js_flags
+
+
+class TextSnapshot:
+
+    def __init__(self, instance: Union[Page, WebElement, LazyWebElement, str]):
+        if isinstance(instance, LazyWebElement):
+            instance.refresh()
+
+        self._text = instance if isinstance(instance, str) else str(instance.text)
+        self._normalized = None
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__} {self._text[:SNIPPET_SIZE]!r}>'
+
+    @property
+    def text(self) -> str:
+        return self._text
+
+    @property
+    def normalized(self) -> str:
+        if self._normalized is None:
+            self._normalized = normalize(self._text)
+
+        return self._normalized
+
+    def search(self, text: str) -> Tuple[bool, str]:
+        text = normalize(text)
+        start = self.normalized.find(text)
+
+        return start >= 0, _snippet(' '.join(self._text.split()), start, len(text))
+
+    def match(self, pattern: Pattern) -> Tuple[bool, str]:
+        match = pattern.search(self._text)
+
+        if match is None:
+            return False, _snippet(self._text, -1, 0)
+
+        return True, _snippet(self._text, match.start(), match.end() - match.start())
+
+
+def _execute_search(instance: Union[Page, WebElement, LazyWebElement], needle: str, flags: Union[str, None]):
+    driver = utils.get_driver(instance)
+    window = instance.window if isinstance(instance, (Page, LazyWebElement)) else None
+    element = None
+
+    with utils.bound_window(driver, window):
+        if isinstance(instance, Page):
+            if not isinstance(instance.parent, WebDriver):
+                element = instance.parent
+        elif isinstance(instance, LazyWebElement):
+            instance.refresh()
+            element = instance.web_element
+        else:
+            element = instance
+
+        try:
+            found, snippet = driver.execute_script(SEARCH_TEXT_SCRIPT, element, needle, flags, SNIPPET_SIZE)
+        except StaleElementReferenceException:
+            return False, ''
+
+    return bool(found), str(snippet)
+
+
+def search_text(instance: Union[Page, WebElement, LazyWebElement, TextSnapshot], text: str) -> Tuple[bool, str]:
+    """
+    Case and whitespace insensitive search of text.
+    Returns found flag and context snippet of the text.
+    """
+    if isinstance(instance, TextSnapshot):
+        return instance.search(text)
+
+    return _execute_search(instance, normalize(text), None)
+
+
+def match_text(instance: Union[Page, WebElement, LazyWebElement, TextSnapshot], pattern: Pattern) -> Tuple[bool, str]:
+    """
+    Search of regular expression in text. Patterns which can not be
+    translated to javascript are matched locally.
+    Returns found flag and context snippet of the text.
+    """
+    if isinstance(instance, TextSnapshot):
+        return instance.match(pattern)
+
+    flags = _js_flags(pattern)
+
+    if flags is None:
+        return TextSnapshot(instance).match(pattern)
+
+    return _execute_search(instance, pattern.pattern, flags)
@@ -2,11 +2,13 @@
 
 import time
 import socket
+import itertools
 from functools import wraps
+from contextlib import contextmanager
 from typing import Union, Callable
 from http.client import HTTPException
 
-from selenium.common.exceptions import WebDriverException
+from selenium.common.exceptions import WebDriverException, StaleElementReferenceException
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.remote.webelement import WebElement
 
@@ -23,6 +25,23 @@ DEFAULT_POLLING_TIMEOUT = 30
 DEFAULT_POLLING_DELAY = 0.5
 
 
+_wait_ticks = itertools.count(1)
+_wait_tick = 0
+
+
+def wait_tick() -> int:
+    """
+    Number of the current waiting_for tick,
+    coalesced driver reads are valid within one tick only
+    """
+    return _wait_tick
+
+
+def _next_wait_tick():
+    global _wait_tick
+    _wait_tick = next(_wait_ticks)
+
+
 def polling(callback: Callable,
             timeout: Union[float, int] = DEFAULT_POLLING_TIMEOUT,
             delay: Union[float, int] = DEFAULT_POLLING_DELAY,
@@ -38,6 +57,8 @@ def polling(callback: Callable,
                     return f(*args, **kwargs)
                 except socket.error:
                     raise
+                except StaleElementReferenceException:
+                    raise
                 except except_exceptions as e:
                     error = e
 
@@ -71,6 +92,7 @@ def waiting_for(callback: Callable,
         t_start = time.time()
 
         while time.time() <= t_start + timeout:
+            _next_wait_tick()
             result = callback(*args, **kwargs)
 
             if result:
@@ -84,6 +106,7 @@ def waiting_for(callback: Callable,
 
             return result
 
+    _next_wait_tick()
     result = callback(*args, **kwargs)
 
     if result:
@@ -103,3 +126,26 @@ def get_driver(instance: Union[WebDriver, WebElement]):
         instance = instance.parent
 
     return instance
+
+
+def activate_window(driver: WebDriver, handle: str):
+    if hasattr(driver, 'activate_window'):
+        driver.activate_window(handle)
+    else:
+        driver.switch_to.window(handle)
+
+
+@contextmanager
+def bound_window(driver: WebDriver, handle: Union[str, None]):
+    """
+    Commands of the block are executed in the window. Pagium drivers
+    switch to it before every command, other drivers are switched once
+    """
+    if handle is None:
+        yield
+    elif hasattr(driver, 'bound_window'):
+        with driver.bound_window(handle):
+            yield
+    else:
+        activate_window(driver, handle)
+        yield
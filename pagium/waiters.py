@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+
+"""
+Registry of pending waits shared by matchers and threads of one driver.
+
+Identical pending conditions are waited by one polling loop,
+other subscribers are woken up with its result.
+
+>>> import threading
+
+>>> calls = []
+
+>>> def condition():
+...     calls.append(1)
+...     return len(calls) >= 3
+
+>>> registry = WaiterRegistry()
+
+>>> def wait():
+...     registry.wait(('condition',), condition, timeout=5, delay=0.05)
+
+>>> threads = [threading.Thread(target=wait) for _ in range(5)]
+
+>>> for thread in threads:
+...     thread.start()
+
+>>> for thread in threads:
+...     thread.join()
+
+>>> len(calls)
+3
+"""
+
+import time
+import threading
+from typing import Union, Callable, Hashable, Tuple
+
+from pagium import utils
+
+
+class _Waiter:
+
+    def __init__(self, owner=None):
+        self.owner = owner
+        self.result = None
+        self.error = None
+        self.subscribers = 0
+        self.event = threading.Event()
+
+
+class WaiterRegistry:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = {}
+
+    def __len__(self):
+        return len(self._pending)
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__} pending={len(self)}>'
+
+    def wait(self,
+             key: Hashable,
+             callback: Callable,
+             timeout: Union[float, int] = utils.DEFAULT_POLLING_TIMEOUT,
+             delay: Union[float, int] = utils.DEFAULT_POLLING_DELAY,
+             args: Union[list, tuple] = None,
+             kwargs: dict = None,
+             owner=None) -> Tuple[object, object]:
+        """
+        Waits for the condition up to own timeout, returns result and
+        owner of the polling loop. If shared loop ends without result
+        earlier, subscriber waits in the next loop for the rest of its time.
+        """
+        key = (key, delay)
+        deadline = time.time() + (timeout or 0)
+
+        while True:
+            with self._lock:
+                waiter = self._pending.get(key)
+                is_owner = waiter is None
+
+                if is_owner:
+                    waiter = self._pending[key] = _Waiter(owner)
+                else:
+                    waiter.subscribers += 1
+
+            if is_owner:
+                return self._poll(key, waiter, callback, deadline, delay, args, kwargs)
+
+            if not waiter.event.wait(max(deadline - time.time(), 0)):
+                return callback(*(args or ()), **(kwargs or {})), owner
+
+            if waiter.error is not None:
+                raise waiter.error
+
+            if waiter.result or time.time() >= deadline:
+                return waiter.result, waiter.owner
+
+    def _poll(self, key, waiter, callback, deadline, delay, args, kwargs):
+        try:
+            waiter.result = utils.waiting_for(
+                callback, args=args, kwargs=kwargs,
+                timeout=max(deadline - time.time(), 0), delay=delay,
+            )
+        except Exception as e:
+            waiter.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._pending[key]
+
+            waiter.event.set()
+
+        return waiter.result, waiter.owner
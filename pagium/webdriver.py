@@ -1,8 +1,14 @@
 # -*- coding: utf-8 -*-
 
+import time
+import threading
 from typing import Union
 from contextlib import contextmanager
 
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.webelement import getAttribute_js, isDisplayed_js
+from selenium.common.exceptions import StaleElementReferenceException
+
 from selenium.webdriver import (
     Remote as _Remote,
     Chrome as _Chrome,
@@ -11,80 +17,390 @@ from selenium.webdriver import (
 )
 
 from pagium import utils
+from pagium.session import SessionLifecycle
+from pagium.waiters import WaiterRegistry
+
+
+IDEMPOTENT_COMMANDS = frozenset((
+    Command.GET_CURRENT_URL,
+    Command.GET_TITLE,
+    Command.GET_PAGE_SOURCE,
+    Command.GET_CURRENT_WINDOW_HANDLE,
+    Command.W3C_GET_CURRENT_WINDOW_HANDLE,
+    Command.GET_WINDOW_HANDLES,
+    Command.W3C_GET_WINDOW_HANDLES,
+    Command.IS_ELEMENT_DISPLAYED,
+    Command.IS_ELEMENT_SELECTED,
+    Command.IS_ELEMENT_ENABLED,
+    Command.GET_ELEMENT_TEXT,
+    Command.GET_ELEMENT_TAG_NAME,
+    Command.GET_ELEMENT_ATTRIBUTE,
+    Command.GET_ELEMENT_PROPERTY,
+    Command.GET_ELEMENT_VALUE_OF_CSS_PROPERTY,
+    Command.GET_ELEMENT_LOCATION,
+    Command.GET_ELEMENT_SIZE,
+    Command.GET_ELEMENT_RECT,
+))
+
+DEFAULT_COALESCING_WINDOW = 0.25
+
+READ_ONLY_COMMANDS = frozenset((
+    Command.FIND_ELEMENT,
+    Command.FIND_ELEMENTS,
+    Command.FIND_CHILD_ELEMENT,
+    Command.FIND_CHILD_ELEMENTS,
+    Command.SCREENSHOT,
+    Command.ELEMENT_SCREENSHOT,
+))
+
+SCRIPT_COMMANDS = frozenset((
+    Command.EXECUTE_SCRIPT,
+    Command.W3C_EXECUTE_SCRIPT,
+))
+
+# selenium atoms of get_attribute and is_displayed for w3c browsers
+_read_only_scripts = {
+    f'return ({getAttribute_js}).apply(null, arguments);',
+    f'return ({isDisplayed_js}).apply(null, arguments);',
+}
+
+
+def register_read_only_script(script: str) -> str:
+    """
+    Registers script without side effects, its results are coalesced
+    as idempotent reads and it does not invalidate other read results
+    """
+    _read_only_scripts.add(script)
+    return script
+
+
+def _is_read_only_script(driver_command, params) -> bool:
+    return driver_command in SCRIPT_COMMANDS and (params or {}).get('script') in _read_only_scripts
+
+
+def _frozen(value):
+    if isinstance(value, dict):
+        return frozenset((k, _frozen(v)) for k, v in value.items())
+
+    if isinstance(value, (list, tuple)):
+        return tuple(_frozen(v) for v in value)
+
+    return value
+
+
+class _PollingState(threading.local):
+    """
+    Polling settings are changed by context managers, so they are kept per thread
+    """
+
+    def __init__(self, timeout, delay):
+        self.timeout = timeout
+        self.delay = delay
+        self.enable = True if timeout else False
+
+
+class _WindowState(threading.local):
+    """
+    Window of the commands of the thread, pages of one driver can be used from several threads
+    """
+
+    def __init__(self):
+        self.handle = None
 
 
 class WEbDriverPollingMixin:
 
     def __init__(self, *args, **kwargs):
-        self._polling_timeout = kwargs.pop('polling_timeout', None)
-        self._polling_delay = kwargs.pop('polling_delay', utils.DEFAULT_POLLING_DELAY)
-        self._enable_polling = True if self._polling_timeout else False
+        self._polling = _PollingState(
+            kwargs.pop('polling_timeout', None),
+            kwargs.pop('polling_delay', utils.DEFAULT_POLLING_DELAY),
+        )
+
+        self._lock = threading.RLock()
+        self._waiters = WaiterRegistry()
+
+        self._coalescing_window = kwargs.pop('coalescing_window', 0)
+
+        max_cached_elements = kwargs.pop('max_cached_elements', None)
+        release_interval = kwargs.pop('release_interval', None)
+        self._lifecycle = None
+
+        if max_cached_elements is not None or release_interval is not None:
+            self._lifecycle = SessionLifecycle(max_cached_elements, release_interval)
 
         self._implicitly_wait = 0
         self._set_script_timeout = 0
+        self._applied_timeouts = {}
+        self._forced_count = 0
+
+        self._window_handle = None
+        self._bound = _WindowState()
+
+        self._coalesced = {}
+        self._coalesced_count = 0
 
         with self.disable_polling():
             super(WEbDriverPollingMixin, self).__init__(*args, **kwargs)
 
     @property
     def polling_timeout(self):
-        return self._polling_timeout
+        return self._polling.timeout
 
     @property
     def polling_delay(self):
-        return self._polling_delay
+        return self._polling.delay
+
+    @property
+    def coalesced_count(self):
+        return self._coalesced_count
+
+    @property
+    def lifecycle(self):
+        return self._lifecycle
+
+    @property
+    def waiters(self):
+        return self._waiters
 
     @contextmanager
     def disable_polling(self, *, force=False):
-        implicitly_wait = script_timeout = 0
-
+        """
+        Forced zero timeouts are shared by all threads, they are
+        reference counted and configured timeouts are restored
+        when the last thread exits
+        """
         if force:
-            implicitly_wait, script_timeout = self._implicitly_wait, self._set_script_timeout
-            self.implicitly_wait(0)
-            self.set_script_timeout(0)
+            with self._lock:
+                if not self._forced_count:
+                    self._apply_timeout('implicit', 0)
+                    self._apply_timeout('script', 0)
 
-        ep = self._enable_polling
-        self._enable_polling = False
+                self._forced_count += 1
+
+        ep = self._polling.enable
+        self._polling.enable = False
 
         try:
             yield
         finally:
-            self._enable_polling = ep
+            self._polling.enable = ep
 
             if force:
-                self.implicitly_wait(implicitly_wait)
-                self.set_script_timeout(script_timeout)
+                with self._lock:
+                    self._forced_count -= 1
+
+                    if not self._forced_count:
+                        self._apply_timeout('implicit', self._implicitly_wait)
+                        self._apply_timeout('script', self._set_script_timeout)
 
     @contextmanager
     def enable_polling(self,
                        timeout: Union[int, float] = utils.DEFAULT_POLLING_TIMEOUT,
                        delay: Union[int, float] = utils.DEFAULT_POLLING_DELAY):
-        pt, pd, ep = self._polling_timeout, self._polling_delay, self._enable_polling
-        self._polling_timeout, self._polling_delay, self._enable_polling = timeout, delay, True
+        polling = self._polling
+        pt, pd, ep = polling.timeout, polling.delay, polling.enable
+        polling.timeout, polling.delay, polling.enable = timeout, delay, True
 
         try:
             yield
         finally:
-            self._polling_timeout, self._polling_delay, self._enable_polling = pt, pd, ep
+            polling.timeout, polling.delay, polling.enable = pt, pd, ep
+
+    @contextmanager
+    def coalesce_commands(self, window: Union[int, float] = DEFAULT_COALESCING_WINDOW):
+        """
+        Dedupes identical idempotent read commands within the window,
+        any other command and every waiting_for tick invalidate read results.
+        Scripts are idempotent reads only if they are registered by
+        register_read_only_script, e.g. selenium atoms of is_displayed
+        and get_attribute and pagium text search and table extraction.
+        Already applied timeouts are never sent again,
+        coalesced_count includes both kinds of skipped commands.
+
+        >>> wd = Remote(
+        ... command_executor='http://localhost:4444/wd/hub',
+        ... desired_capabilities={'browserName': 'chrome'},
+        ... )
+
+        >>> wd.get('data:text/html,<p>coalescing</p>')
+
+        >>> count = wd.coalesced_count
+
+        >>> with wd.coalesce_commands():
+        ...     urls = [wd.current_url, wd.current_url, wd.current_url]
+
+        >>> wd.coalesced_count - count
+        2
 
-    def execute(self, *args, **kwargs):
-        if self._enable_polling:
+        >>> body = wd.find_element_by_tag_name('body')
+
+        >>> count = wd.coalesced_count
+
+        >>> with wd.coalesce_commands():
+        ...     displayed = [body.is_displayed(), body.is_displayed()]
+
+        >>> wd.coalesced_count - count
+        1
+
+        >>> count = wd.coalesced_count
+
+        >>> with wd.coalesce_commands(window=60):
+        ...     assert utils.waiting_for(lambda: wd.current_url, timeout=1)
+        ...     assert utils.waiting_for(lambda: wd.current_url, timeout=1)
+
+        >>> wd.coalesced_count - count
+        0
+
+        >>> wd.implicitly_wait(0)
+
+        >>> count = wd.coalesced_count
+
+        >>> wd.implicitly_wait(0)
+
+        >>> wd.coalesced_count - count
+        1
+
+        >>> wd.quit()
+        """
+        cw = self._coalescing_window
+        self._coalescing_window = window
+
+        try:
+            yield
+        finally:
+            self._coalescing_window = cw
+            self._coalesced.clear()
+
+    def _coalescing_key(self, driver_command, params):
+        if not self._coalescing_window:
+            return None
+
+        if driver_command not in IDEMPOTENT_COMMANDS and not _is_read_only_script(driver_command, params):
+            return None
+
+        try:
+            return driver_command, _frozen(
+                {k: v for k, v in (params or {}).items() if k != 'sessionId'},
+            )
+        except TypeError:
+            return None
+
+    def execute(self, driver_command, params=None):
+        if self._polling.enable:
             execute = utils.polling(
-                super(WEbDriverPollingMixin, self).execute,
-                timeout=self._polling_timeout, delay=self._polling_delay,
+                self._execute, timeout=self._polling.timeout, delay=self._polling.delay,
             )
         else:
-            execute = super(WEbDriverPollingMixin, self).execute
+            execute = self._execute
+
+        return execute(driver_command, params)
+
+    def _execute(self, driver_command, params=None):
+        with self._lock:
+            self._switch_to_bound(driver_command)
+
+            key = self._coalescing_key(driver_command, params)
+
+            if key is None:
+                if driver_command not in READ_ONLY_COMMANDS and not _is_read_only_script(driver_command, params):
+                    self._coalesced.clear()
+            elif key in self._coalesced:
+                t_response, tick, response = self._coalesced[key]
+
+                if tick == utils.wait_tick() and time.time() - t_response <= self._coalescing_window:
+                    self._coalesced_count += 1
+                    return response
+
+            try:
+                response = super(WEbDriverPollingMixin, self).execute(driver_command, params)
+            except StaleElementReferenceException:
+                self._coalesced.clear()
+                raise
+
+            if key is not None:
+                self._coalesced[key] = time.time(), utils.wait_tick(), response
+
+            if driver_command == Command.SWITCH_TO_WINDOW:
+                self._window_handle = params.get('handle', params.get('name'))
+            elif driver_command in (Command.GET_CURRENT_WINDOW_HANDLE, Command.W3C_GET_CURRENT_WINDOW_HANDLE):
+                self._window_handle = response['value']
+            elif driver_command == Command.CLOSE:
+                self._window_handle = None
+
+            return response
+
+    @contextmanager
+    def bound_window(self, handle: str):
+        """
+        Commands of the thread are executed in the window, driver switches
+        to it before every command under the lock of the command, so the
+        lock is not held between commands and polling retries
+        """
+        bound = self._bound.handle
+        self._bound.handle = handle
+
+        try:
+            yield
+        finally:
+            self._bound.handle = bound
+
+    def _switch_to_bound(self, driver_command):
+        handle = self._bound.handle
+
+        if handle is None or handle == self._window_handle or driver_command == Command.SWITCH_TO_WINDOW:
+            return
+
+        params = {'handle': handle} if self.w3c else {'name': handle}
+        super(WEbDriverPollingMixin, self).execute(Command.SWITCH_TO_WINDOW, params)
+
+        self._window_handle = handle
+        self._coalesced.clear()
+
+    def activate_window(self, handle: str):
+        """
+        Switches to the window if it is not active already
+        """
+        with self._lock:
+            if handle != self._window_handle:
+                self.switch_to.window(handle)
+
+    def new_window(self, url: str = 'about:blank') -> str:
+        """
+        Opens new tab in current session and returns its handle,
+        active window is not changed. Tabs are opened under the driver lock,
+        so the new handle is not mixed up with the tab of another thread
+        """
+        with self._lock:
+            handles = set(self.window_handles)
+            self.execute_script('window.open(arguments[0]);', url)
+
+            return next(iter(set(self.window_handles) - handles))
+
+    def _apply_timeout(self, name: str, wait_timeout):
+        if self._applied_timeouts.get(name) == wait_timeout:
+            self._coalesced_count += 1
+            return
+
+        if name == 'implicit':
+            super(WEbDriverPollingMixin, self).implicitly_wait(wait_timeout)
+        else:
+            super(WEbDriverPollingMixin, self).set_script_timeout(wait_timeout)
 
-        return execute(*args, **kwargs)
+        self._applied_timeouts[name] = wait_timeout
 
     def implicitly_wait(self, wait_timeout):
-        self._implicitly_wait = wait_timeout
-        super(WEbDriverPollingMixin, self).implicitly_wait(self._implicitly_wait)
+        with self._lock:
+            self._implicitly_wait = wait_timeout
+
+            if not self._forced_count:
+                self._apply_timeout('implicit', wait_timeout)
 
     def set_script_timeout(self, wait_timeout):
-        self._set_script_timeout = wait_timeout
-        super(WEbDriverPollingMixin, self).set_script_timeout(self._set_script_timeout)
+        with self._lock:
+            self._set_script_timeout = wait_timeout
+
+            if not self._forced_count:
+                self._apply_timeout('script', wait_timeout)
 
 
 class Remote(WEbDriverPollingMixin, _Remote):
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+
+"""
+Pool of browser tabs for running several pages in one driver session.
+
+>>> from pagium.webdriver import Remote
+>>> from pagium.page import Page
+
+>>> wd = Remote(
+... command_executor='http://localhost:4444/wd/hub',
+... desired_capabilities={'browserName': 'chrome'},
+... )
+
+>>> pool = WindowPool(wd)
+
+>>> with pool.page(Page, 'data:text/html,<p>first</p>') as first:
+...     with pool.page(Page, 'data:text/html,<p>second</p>') as second:
+...         assert first.text == 'first' and second.text == 'second'
+
+>>> assert len(pool) == 2
+
+>>> pool.close()
+
+>>> wd.quit()
+"""
+
+import threading
+from typing import List
+from contextlib import contextmanager
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from pagium import utils
+
+
+class WindowPool:
+
+    def __init__(self, driver: WebDriver, size: int = None):
+        self._driver = driver
+        self._size = size
+
+        self._lock = threading.Lock()
+
+        self._handles = [driver.current_window_handle]
+        self._free = list(self._handles)
+
+    def __len__(self):
+        return len(self._handles)
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__} {len(self._free)}/{len(self._handles)} free>'
+
+    @property
+    def handles(self) -> List[str]:
+        return list(self._handles)
+
+    def acquire(self) -> str:
+        with self._lock:
+            if self._free:
+                return self._free.pop()
+
+            if self._size is not None and len(self._handles) >= self._size:
+                raise AssertionError(
+                    f'Window pool size "{self._size}" exceeded',
+                )
+
+            if hasattr(self._driver, 'new_window'):
+                handle = self._driver.new_window()
+            else:
+                handles = set(self._driver.window_handles)
+                self._driver.execute_script('window.open();')
+                handle = next(iter(set(self._driver.window_handles) - handles))
+
+            self._handles.append(handle)
+
+            return handle
+
+    def release(self, handle: str):
+        with self._lock:
+            if handle not in self._handles:
+                raise AssertionError(
+                    f'Window "{handle}" is not from the pool',
+                )
+
+            if handle not in self._free:
+                self._free.append(handle)
+
+    @contextmanager
+    def window(self):
+        handle = self.acquire()
+
+        try:
+            yield handle
+        finally:
+            self.release(handle)
+
+    @contextmanager
+    def page(self, page_class: type, url: str, **options):
+        """
+        Opens page in the free tab of the pool and releases the tab on exit
+        """
+        with self.window() as handle:
+            with page_class(self._driver, url, window=handle, **options) as page:
+                yield page
+
+    def close(self):
+        """
+        Closes all tabs of the pool except the first one
+        """
+        with self._lock:
+            main, *handles = self._handles
+
+            for handle in handles:
+                utils.activate_window(self._driver, handle)
+                self._driver.close()
+
+            utils.activate_window(self._driver, main)
+
+            self._handles = [main]
+            self._free = [main]